@@ -38,15 +38,20 @@ class PlaintextCredentialLoader(CredentialLoader):
         """
         super().__init__()
         self.fpath = fpath
+        self._cached = None
 
     def load_credentials(self) -> str:
+        if self._cached is not None:
+            return self._cached
         if not os.path.exists(self.fpath):
             raise FileNotFoundError(f"Cannot find credentials file {self.fpath}")
         with open(self.fpath, "r") as fh:
-            lines = fh.readlines()
-            if len(lines) != 1:
-                raise NotImplementedError(
-                    f"Not sure how to interpret multiline credential file {self.fpath} " f"({len(lines)} lines)."
-                )
-            credentials = lines[0].rstrip("\n")
+            raw = fh.read(4096)
+        lines = [line for line in raw.split("\n") if line.strip()]
+        if len(lines) != 1:
+            raise NotImplementedError(
+                f"Not sure how to interpret multiline credential file {self.fpath} " f"({len(lines)} lines)."
+            )
+        credentials = lines[0]
+        self._cached = credentials
         return credentials
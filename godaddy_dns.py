@@ -4,15 +4,28 @@ Retrieve GoDaddy DNS settings via their developer API
 See also:
     https://developer.godaddy.com/doc/endpoint/domains#/
 """
+import functools
+import json
+import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
-from typing import List
+from typing import Dict, List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import credential_loaders
 
+try:
+    # optional, faster JSON decoder
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 BASE_URL = "https://api.godaddy.com"
 
 # You can easily replace these with a different CredentialLoader to match your key management system
@@ -21,10 +34,88 @@ API_SECRET_CRED_LOADER = credential_loaders.EnvVarCredentialLoader("GODADDY_API_
 # API_KEY_CRED_LOADER = credential_loaders.PlaintextCredentialLoader("./api_key.txt")
 # API_SECRET_CRED_LOADER = credential_loaders.PlaintextCredentialLoader("./api_secret.txt")
 
+# Number of API requests kept in flight
+MAX_WORKERS = 8
+# GoDaddy allows roughly 60 requests per minute per API key
+RATE_LIMIT_RPS = 1.0
+RATE_LIMIT_BURST = 5
+
+# API responses (never credentials) are cached on disk so re-running during a migration skips repeat calls
+CACHE_DIR = os.path.expanduser("~/.cache/godaddy_dns_migrator")
+CACHE_TTL_SECONDS = 600
+
+# Pooled session that reuses connections and retries throttled (429) or failed (5xx) requests with backoff
+SESSION = requests.Session()
+_RETRY = Retry(
+    total=6,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=True,
+)
+
+
+def set_concurrency(max_workers: int):
+    """Size the connection pool for max_workers concurrent API requests.
+
+    All calls go to a single host, so one connection pool with a connection per worker lets every in-flight request
+    reuse a warm keep-alive connection rather than opening (and discarding) extra ones.
+    """
+    SESSION.mount("https://", HTTPAdapter(max_retries=_RETRY, pool_connections=1, pool_maxsize=max_workers))
+
+
+set_concurrency(MAX_WORKERS)
+
+
+class UnknownDomainError(Exception):
+    """GoDaddy has no DNS zone file for the domain (e.g. it isn't registered there, or its DNS is hosted elsewhere)."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Thread-safe token bucket rate limiter.  Share one instance across workers to cap their combined rate.
+
+        Args:
+            rate: tokens refilled per second (i.e. sustained requests per second)
+            burst: maximum number of tokens that can accumulate while idle
+        """
+        if rate <= 0:
+            raise ValueError(f"{self.__class__.__name__} rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"{self.__class__.__name__} burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self._cond.wait((1 - self._tokens) / self.rate)
+
 
+# Shared by every API call, regardless of which thread makes it
+_BUCKET = TokenBucket(RATE_LIMIT_RPS, burst=RATE_LIMIT_BURST)
 
+
+def set_rate_limit(rps: float, burst: int = RATE_LIMIT_BURST):
+    """Replace the rate limit shared by all API calls (e.g. to push closer to your account's limit)."""
+    global _BUCKET
+    _BUCKET = TokenBucket(rps, burst=burst)
+
+
+@functools.lru_cache(maxsize=1)
 def _get_headers() -> dict:
-    """Get authorization header for GoDaddy Developer API.
+    """Get authorization header for GoDaddy Developer API.  Computed once per process.
 
     https://developer.godaddy.com/keys
     """
@@ -38,10 +129,47 @@ def _call_endpoint(url_suffix: str, base_url: str = BASE_URL) -> dict:
 
     Only supports GET endpoints to keep access read-only.
     """
+    _BUCKET.acquire()
     headers = _get_headers()
-    url = os.path.join(base_url, url_suffix)
-    resp = requests.get(url, headers=headers)
-    return resp.json()
+    url = f"{base_url.rstrip('/')}/{url_suffix.lstrip('/')}"
+    resp = SESSION.get(url, headers=headers, timeout=10)
+    resp.raise_for_status()
+    return _json_loads(resp.content)
+
+
+def _cache_path(url_suffix: str) -> str:
+    return os.path.join(CACHE_DIR, url_suffix.replace("/", "_") + ".json")
+
+
+def _read_cache(url_suffix: str):
+    """Return cached response for url_suffix, or None if missing or older than CACHE_TTL_SECONDS."""
+    path = _cache_path(url_suffix)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL_SECONDS:
+            return None
+        with open(path, "r") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(url_suffix: str, response):
+    """Cache response for url_suffix on disk.  Failing to cache is logged, never fatal."""
+    path = _cache_path(url_suffix)
+    # write to a temp file then rename, so concurrent readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        try:
+            with open(tmp_path, "w") as fh:
+                json.dump(response, fh)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    except OSError as e:
+        logging.warning(f"Could not cache response in {path}: {e}")
 
 
 def get_domains() -> List[str]:
@@ -66,31 +194,73 @@ def get_domains() -> List[str]:
     return domains
 
 
-def get_domain_dns_records(domain):
+def get_domain_dns_records(domain, use_cache: bool = True):
     """Get DNS entries for a specific domain
 
+    Args:
+        domain: domain to look up (e.g. "mydomain.com")
+        use_cache: reuse a response cached on disk within the last CACHE_TTL_SECONDS, if any
+
     Returns:
         List with format (for example):
         [ {'data': '160.153.162.20', 'name': '_dmarc', 'ttl': 3600, 'type': 'A'},
           {'data': 'ns37.domaincontrol.com', 'name': '@', 'ttl': 3600, 'type': 'NS'}, ...]
     """
     url_suffix = "v1/domains/{}/records".format(domain)
-    ret = _call_endpoint(url_suffix)
-    if isinstance(ret, dict) and ret.get('code', None) == "UNKNOWN_DOMAIN":
-        # e.g. {'code': 'UNKNOWN_DOMAIN', 'message': 'The given domain is not registered, or does not have a zone file'}
-        raise Exception(f"Can't find domain {domain}.  Are you sure your API key and secret are correct?: {ret}")
+    if use_cache:
+        ret = _read_cache(url_suffix)
+        if ret is not None:
+            logging.info(
+                f"Using cached records for {domain} from {_cache_path(url_suffix)} (up to {CACHE_TTL_SECONDS}s old). "
+                "Disable the cache to fetch fresh records."
+            )
+            return ret
+    try:
+        ret = _call_endpoint(url_suffix)
+    except requests.HTTPError as e:
+        try:
+            ret = e.response.json()
+        except ValueError:
+            raise e
+        if isinstance(ret, dict) and ret.get('code', None) == "UNKNOWN_DOMAIN":
+            # e.g. {'code': 'UNKNOWN_DOMAIN', 'message': 'The given domain is not registered, or does not have a zone file'}
+            raise UnknownDomainError(
+                f"Can't find domain {domain}.  Are you sure your API key and secret are correct?: {ret}"
+            ) from e
+        raise
+    _write_cache(url_suffix, ret)
     return ret
 
 
-def print_all_dns_records():
+def get_many_domain_dns_records(
+    domains: List[str], max_workers: int = MAX_WORKERS, use_cache: bool = True
+) -> Dict[str, List[dict]]:
+    """Get DNS entries for several domains concurrently, sharing one rate limit.
+
+    Domains without a GoDaddy zone file (UnknownDomainError) are skipped with a warning, so one such domain doesn't
+    discard the others.  Any other failure (timeouts, exhausted retries, unexpected API errors) is raised.
+
+    Returns:
+        Dict mapping each fetched domain to its records (see get_domain_dns_records)
+    """
+    domain_to_records = dict()
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = [(d, ex.submit(get_domain_dns_records, d, use_cache=use_cache)) for d in domains]
+        for domain, future in futures:
+            try:
+                domain_to_records[domain] = future.result()
+            except UnknownDomainError as e:
+                logging.warning(f"Skipping {domain}, GoDaddy has no DNS zone file for it: {e}")
+    return domain_to_records
+
+
+def print_all_dns_records(use_cache: bool = True):
     """ Print each domain and its DNS records (for domains linked to this API key)."""
-    for domain in sorted(get_domains()):
-        dns_records = get_domain_dns_records(domain)
+    domain_to_records = get_many_domain_dns_records(sorted(get_domains()), use_cache=use_cache)
+    for domain, dns_records in domain_to_records.items():
         print(domain)
         pprint(dns_records)
         print("*" * 50)
-        # TODO: poor man's rate limiter.  improve?
-        time.sleep(2)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,17 @@ a config file for use with Terraform."""
 import argparse
 import logging
 from collections import defaultdict
+from pathlib import Path
 from typing import Dict, List
 
 import godaddy_dns
 
 DEFAULT_OUTPUT_FILE = "migrated.tf"
 
+# str.translate tables for building terraform resource names in a single pass
+_ZONE_NAME_TRANSLATE = str.maketrans({".": "-"})
+_TF_RESOURCE_NAME_TRANSLATE = str.maketrans({".": "-", "_": ""})
+
 
 def zone_url_to_name(zone_url):
     """Sanitize DNS zone for terraform resource names
@@ -16,12 +21,12 @@ def zone_url_to_name(zone_url):
     zone_url_to_name("mydomain.com.")
     >>> "mydomain-com"
     """
-    return zone_url.rstrip(".").replace(".", "-")
+    return zone_url.rstrip(".").translate(_ZONE_NAME_TRANSLATE)
 
 
 def sanitize_tf_resource_name(name):
     """Sanitize concatenated name for terraform resource names"""
-    return name.replace(".", "-").replace("_", "")
+    return name.translate(_TF_RESOURCE_NAME_TRANSLATE)
 
 
 def terraform_zone_stanza(zone_url):
@@ -39,24 +44,24 @@ resource "google_dns_managed_zone" "{zone_name}" {{
 """
 
 
-def godaddy_to_url(godaddy_attr, zone_url, is_rrdatas=False, is_TXT_data=False, use_terraform_var=False):
+def terraform_zone_suffix(zone_name):
+    """Terraform variable for a GCP managed DNS zone's url (e.g. "${google_dns_managed_zone.mydomain-com.dns_name}")"""
+    return f"${{google_dns_managed_zone.{zone_name}.dns_name}}"
+
+
+def godaddy_to_url(godaddy_attr, suffix, is_rrdatas=False, is_TXT_data=False):
     """ Convert name from GoDaddy record into url for GCP terraform.
 
     For example "subdomain.mydomain.com" or "subdomain.${google_dn_managed_zone.mydomain-com.dns_name}"
 
     Args:
         godaddy_name: value from godaddy record ("name" or "data" field)
-        zone_url: url for output zone (e.g. "mydomain.es")
+        suffix: url for output zone, either inlined (e.g. "mydomain.es") or as a Terraform variable (see
+            terraform_zone_suffix)
         is_rrdatas: will return value be used in rrdatas field?
         is_TXT_data: did entry original from TXT data value?
-        use_terraform_var: use a Terraform variable for DNS zone url?  (If not, inline domain url directly)
 
     """
-    if use_terraform_var:
-        suffix = f"${{google_dns_managed_zone.{zone_url_to_name(zone_url)}.dns_name}}"
-    else:
-        suffix = zone_url
-
     # Godaddy usually specifies the website url as a prefix to the zone url.  When there is no prefix, they use "@"
     if godaddy_attr == "@":
         return suffix
@@ -71,25 +76,23 @@ def godaddy_to_url(godaddy_attr, zone_url, is_rrdatas=False, is_TXT_data=False,
 
 def get_ttl(godaddy_records):
     """Warn user godaddy records for one type and name (e.g. "TXT" records for "subdomain.mydomain.com") have different TTLs"""
-    unique_ttls = set([r["ttl"] for r in godaddy_records])
-    ttl = list(unique_ttls)[0]
-    if len(unique_ttls) > 1:
+    ttl = godaddy_records[0]["ttl"]
+    if any(r["ttl"] != ttl for r in godaddy_records):
         logging.warning(f"Found multiple TTLs for following records.  Using {ttl}. {godaddy_records}")
     return ttl
 
 
-def terraform_A_record_set(godaddy_records, zone_url):
+def terraform_A_record_set(godaddy_records, zone_url, zone_name, suffix):
     godaddy_name = godaddy_records[0]["name"]
     resource_name = sanitize_tf_resource_name(godaddy_to_url(godaddy_name, zone_url))
-    url = godaddy_to_url(godaddy_name, zone_url, use_terraform_var=True)
+    url = godaddy_to_url(godaddy_name, suffix)
 
-    rrdata_strings = list(map(lambda r: f'"{r["data"]}",', godaddy_records))
-    rrdatas_string = "[" + "\n\t".join(rrdata_strings) + "]"
+    rrdatas_string = "[" + ",\n\t".join(f'"{r["data"]}"' for r in godaddy_records) + "]"
 
     record_block = f"""
 resource "google_dns_record_set" "{resource_name}-a" {{
     name = "{url}"
-    managed_zone = google_dns_managed_zone.{zone_url_to_name(zone_url)}.name
+    managed_zone = google_dns_managed_zone.{zone_name}.name
     type = "A"
     ttl = {get_ttl(godaddy_records)}
     rrdatas = {rrdatas_string}
@@ -98,20 +101,20 @@ resource "google_dns_record_set" "{resource_name}-a" {{
     return record_block
 
 
-def terraform_CNAME_record_set(godaddy_records, zone_url):
+def terraform_CNAME_record_set(godaddy_records, zone_url, zone_name, suffix):
     if len(godaddy_records) != 1:
         raise NotImplementedError("Not sure how to handle multiple CNAME records")
     godaddy_record = godaddy_records[0]
     godaddy_name = godaddy_record["name"]
     resource_name = sanitize_tf_resource_name(godaddy_to_url(godaddy_name, zone_url))
-    url = godaddy_to_url(godaddy_name, zone_url, use_terraform_var=True)
+    url = godaddy_to_url(godaddy_name, suffix)
     # TODO: bad suffix logic?
-    target = godaddy_to_url(godaddy_record["data"], zone_url, is_rrdatas=True, use_terraform_var=True)
+    target = godaddy_to_url(godaddy_record["data"], suffix, is_rrdatas=True)
 
     record_block = f"""
 resource "google_dns_record_set" "{resource_name}-cname" {{
     name = "{url}"
-    managed_zone = google_dns_managed_zone.{zone_url_to_name(zone_url)}.name
+    managed_zone = google_dns_managed_zone.{zone_name}.name
     type = "CNAME"
     ttl = {godaddy_record['ttl']}
     rrdatas = ["{target}"]
@@ -120,21 +123,20 @@ resource "google_dns_record_set" "{resource_name}-cname" {{
     return record_block
 
 
-def terraform_MX_record_set(godaddy_records, zone_url):
+def terraform_MX_record_set(godaddy_records, zone_url, zone_name, suffix):
     godaddy_name = godaddy_records[0]["name"]
     resource_name = sanitize_tf_resource_name(godaddy_to_url(godaddy_name, zone_url))
-    url = godaddy_to_url(godaddy_name, zone_url, use_terraform_var=True)
+    url = godaddy_to_url(godaddy_name, suffix)
 
     priority_addresses = [(r["priority"], r["data"]) for r in godaddy_records]
     priority_addresses.sort(key=lambda pa: pa[0])  # inplace sort
 
-    rrdata_strings = list(map(lambda pa: f'"{pa[0]} {pa[1]}.",', priority_addresses))
-    rrdatas_string = "[" + "\n\t".join(rrdata_strings) + "]"
+    rrdatas_string = "[" + ",\n\t".join(f'"{priority} {address}."' for priority, address in priority_addresses) + "]"
 
     record_block = f"""
 resource "google_dns_record_set" "{resource_name}-mx" {{
     name = "{url}"
-    managed_zone = google_dns_managed_zone.{zone_url_to_name(zone_url)}.name
+    managed_zone = google_dns_managed_zone.{zone_name}.name
     type = "MX"
     ttl = {get_ttl(godaddy_records)}
     rrdatas = {rrdatas_string}
@@ -148,20 +150,14 @@ def convert_data_for_TXT(orig_data):
     orig_data = f'\\"{orig_data}\\""'
 
     # for very long rrdatas, need to add quotes between each 255char substring
-    idx = 0
-    tgt = '"'
-    while idx < len(orig_data):
-        tgt += orig_data[idx : idx + 255]
-        idx += 255
-        if idx < len(orig_data):
-            tgt += r"\" \""
-    return tgt
+    chunks = [orig_data[idx : idx + 255] for idx in range(0, len(orig_data), 255)]
+    return '"' + r"\" \"".join(chunks)
 
 
-def terraform_TXT_record_set(godaddy_records, zone_url):
+def terraform_TXT_record_set(godaddy_records, zone_url, zone_name, suffix):
     godaddy_name = godaddy_records[0]["name"]
     resource_name = sanitize_tf_resource_name(godaddy_to_url(godaddy_name, zone_url))
-    url = godaddy_to_url(godaddy_name, zone_url, use_terraform_var=True)
+    url = godaddy_to_url(godaddy_name, suffix)
 
     # Merge multiple TXT records using a comma (https://serverfault.com/a/1013575)
     target_strs = []
@@ -173,7 +169,7 @@ def terraform_TXT_record_set(godaddy_records, zone_url):
     record_block = f"""
 resource "google_dns_record_set" "{resource_name}-txt" {{
     name = "{url}"
-    managed_zone = google_dns_managed_zone.{zone_url_to_name(zone_url)}.name
+    managed_zone = google_dns_managed_zone.{zone_name}.name
     type = "TXT"
     ttl = {get_ttl(godaddy_records)}
     rrdatas = [{target}]
@@ -182,34 +178,60 @@ resource "google_dns_record_set" "{resource_name}-txt" {{
     return record_block
 
 
-def group_records_by_type_name(godaddy_records) -> Dict[str, Dict[str, List[Dict]]]:
+# Record types this script can migrate, in the order they are written to the Terraform file
+_WRITERS = {
+    "A": terraform_A_record_set,
+    "CNAME": terraform_CNAME_record_set,
+    "MX": terraform_MX_record_set,
+    "TXT": terraform_TXT_record_set,
+}
+
+
+def group_records_by_type_name(godaddy_records) -> Dict[str, List[List[Dict]]]:
     """
-    Sorts godaddy DNS records into two layer dictionary:
+    Sorts godaddy DNS records by type, then groups records of that type sharing the same name:
 
     {
-        'A': {'api.edison.merantix.com': [record_1, record_2]},
-              'merantix.com': [record_1],...
-              },
-        'CNAME': {name: [record_1, ...
-    }}
+        'A': [[record_1, record_2],  # e.g. both named 'api.edison'
+              [record_3],...         # e.g. named '@'
+              ],
+        'CNAME': [[record_1, ...
+    ]}
 
     """
-    type_to_records = defaultdict(list)
+    type_name_to_records = defaultdict(list)
     for record in godaddy_records:
-        type_to_records[record["type"]].append(record)
-    type_to_records = dict(type_to_records)
+        type_name_to_records[(record["type"], record["name"])].append(record)
+
+    type_to_groups = dict()
+    for (record_type, _), records in type_name_to_records.items():
+        type_to_groups.setdefault(record_type, []).append(records)
+
+    return type_to_groups
+
+
+def _zone_stanzas(zone_url: str, records: List[Dict]) -> List[str]:
+    """Convert the records for one DNS zone into a list of Terraform config stanzas"""
+    type_to_groups = group_records_by_type_name(records)
+    zone_name = zone_url_to_name(zone_url)
+    suffix = terraform_zone_suffix(zone_name)
+
+    parts = []
+    append = parts.append
+    append(terraform_zone_stanza(zone_url))
 
-    type_to_name_to_records = dict()
-    for record_type, records in type_to_records.items():
-        name_to_records = defaultdict(list)
-        for record in records:
-            name_to_records[record["name"]].append(record)
-        type_to_name_to_records[record_type] = dict(name_to_records)
+    for record_type, writer in _WRITERS.items():
+        for records_for_name in type_to_groups.get(record_type, []):
+            append(writer(records_for_name, zone_url, zone_name, suffix))
 
-    return type_to_name_to_records
+    # NOTE: ignore NS (Name Server) records because these are determined by GCP automatically and cannot be changed.
+    for record_type in sorted(type_to_groups.keys() - _WRITERS.keys() - {"NS"}):
+        logging.warning(f"No logic for migrating record type {record_type}: {type_to_groups[record_type]}")
 
+    return parts
 
-def export_godaddy_dns_to_tf_file(zone_url: str, output_file: str = DEFAULT_OUTPUT_FILE):
+
+def export_godaddy_dns_to_tf_file(zone_url: str, output_file: str = DEFAULT_OUTPUT_FILE, use_cache: bool = True):
     """
     Reads the DNS settings for godaddy_zone_url (e.g. "mydomain.com") and exports them to a Terraform file for use
     in a Google Cloud Project DNS Zone.
@@ -217,48 +239,86 @@ def export_godaddy_dns_to_tf_file(zone_url: str, output_file: str = DEFAULT_OUTP
     Args:
         zone_url: DNS zone to migrate. (e.g. "mydomain.com")
         output_file: filepath to output terraform config
+        use_cache: reuse recently fetched GoDaddy records cached on disk
     """
-    records = godaddy_dns.get_domain_dns_records(zone_url)
-    type_to_name_to_records = group_records_by_type_name(records)
-
-    with open(output_file, "w") as f:
-        f.write(terraform_zone_stanza(zone_url))
+    records = godaddy_dns.get_domain_dns_records(zone_url, use_cache=use_cache)
+    parts = _zone_stanzas(zone_url, records)
 
-        if "A" in type_to_name_to_records:
-            for A_records in type_to_name_to_records["A"].values():
-                f.write(terraform_A_record_set(A_records, zone_url))
+    Path(output_file).write_bytes("".join(parts).encode("utf-8"))
+    logging.info(f"Wrote file {output_file}")
 
-        if "CNAME" in type_to_name_to_records:
-            for CNAME_records in type_to_name_to_records["CNAME"].values():
-                f.write(terraform_CNAME_record_set(CNAME_records, zone_url))
 
-        if "MX" in type_to_name_to_records:
-            for MX_records in type_to_name_to_records["MX"].values():
-                f.write(terraform_MX_record_set(MX_records, zone_url))
+def export_all_godaddy_dns_to_tf_file(
+    output_file: str = DEFAULT_OUTPUT_FILE, use_cache: bool = True, max_workers: int = godaddy_dns.MAX_WORKERS
+):
+    """
+    Reads the DNS settings for every domain linked to the GoDaddy API key and exports them to a single Terraform file.
 
-        if "TXT" in type_to_name_to_records:
-            for TXT_records in type_to_name_to_records["TXT"].values():
-                f.write(terraform_TXT_record_set(TXT_records, zone_url))
+    Args:
+        output_file: filepath to output terraform config
+        use_cache: reuse recently fetched GoDaddy records cached on disk
+        max_workers: number of GoDaddy API requests to keep in flight
+    """
+    domains = sorted(godaddy_dns.get_domains())
+    domain_to_records = godaddy_dns.get_many_domain_dns_records(domains, max_workers=max_workers, use_cache=use_cache)
+    if not domain_to_records:
+        logging.warning(f"No DNS records found for any domain.  Not writing {output_file}")
+        return
 
-    for record_type, name_to_records in type_to_name_to_records.items():
-        # NOTE: ignore NS (Name Server) records because these are determined by GCP automatically and cannot be changed.
-        if record_type not in ["A", "CNAME", "MX", "NS", "TXT"]:
-            logging.warning(f"No logic for migrating record type {record_type}: {name_to_records}")
+    parts = []
+    for zone_url, records in domain_to_records.items():
+        parts.extend(_zone_stanzas(zone_url, records))
 
+    Path(output_file).write_bytes("".join(parts).encode("utf-8"))
     logging.info(f"Wrote file {output_file}")
 
 
+def _positive_int(value):
+    """argparse type for flags that must be a positive integer"""
+    ivalue = int(value)
+    if ivalue < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return ivalue
+
+
+def _positive_float(value):
+    """argparse type for flags that must be a positive number"""
+    fvalue = float(value)
+    if not fvalue > 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number, got {value}")
+    return fvalue
+
+
 def main():
     logging.basicConfig(level=logging.INFO)
 
     # get domain name from command line
     parser = argparse.ArgumentParser()
-    parser.add_argument("--domain", help="domain name to migrate (e.g. mydomain.com)", required=True)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--domain", help="domain name to migrate (e.g. mydomain.com)")
+    group.add_argument("--all", action="store_true", help="migrate every domain linked to the GoDaddy API key")
+    parser.add_argument("--no-cache", action="store_true", help="ignore GoDaddy records cached by a recent run")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="filepath to output terraform config")
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=godaddy_dns.MAX_WORKERS,
+        help="GoDaddy API requests to keep in flight",
+    )
+    parser.add_argument(
+        "--rps", type=_positive_float, default=godaddy_dns.RATE_LIMIT_RPS, help="max GoDaddy API requests per second"
+    )
     args = parser.parse_args()
-    domain = args.domain
+    use_cache = not args.no_cache
+    godaddy_dns.set_rate_limit(args.rps)
+    godaddy_dns.set_concurrency(args.concurrency)
 
-    logging.info(f"Migrating {domain}")
-    export_godaddy_dns_to_tf_file(domain)
+    if args.all:
+        logging.info("Migrating all domains")
+        export_all_godaddy_dns_to_tf_file(args.output, use_cache=use_cache, max_workers=args.concurrency)
+    else:
+        logging.info(f"Migrating {args.domain}")
+        export_godaddy_dns_to_tf_file(args.domain, args.output, use_cache=use_cache)
 
 
 if __name__ == "__main__":
@@ -35,6 +35,7 @@ if __name__ == "__main__":
         url="https://github.com/JohnMcSpedon/GoDaddy_DNS_migrator",
         author="John McSpedon",
         license="MIT",
-        install_requires=["requests"],
+        install_requires=["requests", "urllib3>=1.26"],
+        extras_require={"fast": ["orjson"]},
         packages=find_packages(exclude=["tests*"]),
     )
@@ -0,0 +1,33 @@
+"""Pin the Terraform string formatting of TXT data, in particular the splitting into 255-char substrings."""
+import pytest
+
+from godaddy_dns_to_gcp_terraform import convert_data_for_TXT
+
+# convert_data_for_TXT wraps data in escaped quotes, then splits the result into 255-char chunks
+OPEN = '\\"'
+CLOSE = '\\""'
+SEP = '\\" \\"'
+
+
+@pytest.mark.parametrize(
+    "orig_data, expected",
+    [
+        ("", '"' + OPEN + CLOSE),
+        ("v=spf1 ~all", '"' + OPEN + "v=spf1 ~all" + CLOSE),
+        # wrapped data is exactly 255 chars: one chunk
+        ("a" * 250, '"' + OPEN + "a" * 250 + CLOSE),
+        # wrapped data is 256 chars: the closing quote spills into a second chunk
+        ("a" * 251, '"' + OPEN + "a" * 251 + '\\"' + SEP + '"'),
+        ("a" * 254, '"' + OPEN + "a" * 253 + SEP + "a" + CLOSE),
+        ("a" * 255, '"' + OPEN + "a" * 253 + SEP + "aa" + CLOSE),
+        ("a" * 256, '"' + OPEN + "a" * 253 + SEP + "aaa" + CLOSE),
+    ],
+)
+def test_convert_data_for_TXT(orig_data, expected):
+    assert convert_data_for_TXT(orig_data) == expected
+
+
+def test_convert_data_for_TXT_10KB():
+    # 10240 chars + 5 quote chars = 40 full chunks of 255 and a final chunk of 45
+    chunks = [OPEN + "a" * 253] + ["a" * 255] * 39 + ["a" * 42 + CLOSE]
+    assert convert_data_for_TXT("a" * 10240) == '"' + SEP.join(chunks)
@@ -0,0 +1,85 @@
+"""On-disk cache of GoDaddy DNS records used by get_domain_dns_records."""
+import json
+import logging
+import os
+import time
+
+import pytest
+import requests
+
+import godaddy_dns
+
+DOMAIN = "example.com"
+RECORDS = [{"data": "1.2.3.4", "name": "@", "ttl": 600, "type": "A"}]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(godaddy_dns, "CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    """Replace the GoDaddy API with one that always returns RECORDS, and record each call made."""
+    calls = []
+
+    def fake_call_endpoint(url_suffix, base_url=godaddy_dns.BASE_URL):
+        calls.append(url_suffix)
+        return RECORDS
+
+    monkeypatch.setattr(godaddy_dns, "_call_endpoint", fake_call_endpoint)
+    return calls
+
+
+def _cache_file(cache_dir):
+    return cache_dir / f"v1_domains_{DOMAIN}_records.json"
+
+
+def test_cache_hit(cache_dir, api_calls):
+    assert godaddy_dns.get_domain_dns_records(DOMAIN) == RECORDS
+    assert godaddy_dns.get_domain_dns_records(DOMAIN) == RECORDS
+    assert len(api_calls) == 1
+    assert json.loads(_cache_file(cache_dir).read_text()) == RECORDS
+    assert os.listdir(cache_dir) == [_cache_file(cache_dir).name]  # no leftover temp files
+
+
+def test_expired_entry_is_refetched(cache_dir, api_calls):
+    godaddy_dns.get_domain_dns_records(DOMAIN)
+    expired = time.time() - godaddy_dns.CACHE_TTL_SECONDS - 1
+    os.utime(_cache_file(cache_dir), (expired, expired))
+
+    assert godaddy_dns.get_domain_dns_records(DOMAIN) == RECORDS
+    assert len(api_calls) == 2
+
+
+def test_use_cache_false_always_fetches(cache_dir, api_calls):
+    godaddy_dns.get_domain_dns_records(DOMAIN)
+    assert godaddy_dns.get_domain_dns_records(DOMAIN, use_cache=False) == RECORDS
+    assert len(api_calls) == 2
+
+
+def test_unwritable_cache_dir_still_returns_records(tmp_path, monkeypatch, api_calls, caplog):
+    not_a_dir = tmp_path / "not_a_dir"
+    not_a_dir.write_text("")
+    monkeypatch.setattr(godaddy_dns, "CACHE_DIR", str(not_a_dir / "cache"))
+
+    with caplog.at_level(logging.WARNING):
+        assert godaddy_dns.get_domain_dns_records(DOMAIN) == RECORDS
+    assert "Could not cache response" in caplog.text
+
+
+def test_unknown_domain_is_not_cached(cache_dir, monkeypatch):
+    resp = requests.Response()
+    resp.status_code = 404
+    resp._content = b'{"code": "UNKNOWN_DOMAIN", "message": "The given domain is not registered"}'
+
+    def fake_call_endpoint(url_suffix, base_url=godaddy_dns.BASE_URL):
+        raise requests.HTTPError(response=resp)
+
+    monkeypatch.setattr(godaddy_dns, "_call_endpoint", fake_call_endpoint)
+
+    with pytest.raises(godaddy_dns.UnknownDomainError):
+        godaddy_dns.get_domain_dns_records(DOMAIN)
+    assert not cache_dir.exists() or not os.listdir(cache_dir)
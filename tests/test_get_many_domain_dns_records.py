@@ -0,0 +1,31 @@
+"""Only domains without a GoDaddy zone file may be skipped when fetching many domains; other errors must surface."""
+import pytest
+import requests
+
+import godaddy_dns
+
+RECORDS = [{"data": "1.2.3.4", "name": "@", "ttl": 600, "type": "A"}]
+
+
+def _fake_get_domain_dns_records(failures):
+    def fetch(domain, use_cache=True):
+        if domain in failures:
+            raise failures[domain]
+        return RECORDS
+
+    return fetch
+
+
+def test_skips_unknown_domains(monkeypatch):
+    failures = {"b.com": godaddy_dns.UnknownDomainError("no zone file")}
+    monkeypatch.setattr(godaddy_dns, "get_domain_dns_records", _fake_get_domain_dns_records(failures))
+
+    assert godaddy_dns.get_many_domain_dns_records(["a.com", "b.com", "c.com"]) == {"a.com": RECORDS, "c.com": RECORDS}
+
+
+def test_raises_other_errors(monkeypatch):
+    failures = {"b.com": requests.exceptions.RetryError("too many 429 error responses")}
+    monkeypatch.setattr(godaddy_dns, "get_domain_dns_records", _fake_get_domain_dns_records(failures))
+
+    with pytest.raises(requests.exceptions.RetryError):
+        godaddy_dns.get_many_domain_dns_records(["a.com", "b.com", "c.com"])
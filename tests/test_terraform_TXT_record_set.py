@@ -0,0 +1,20 @@
+"""TXT record sets must inline the zone url for "@" data, not the Terraform dns_name variable (which ends in ".")."""
+from godaddy_dns_to_gcp_terraform import terraform_TXT_record_set, terraform_zone_suffix, zone_url_to_name
+
+
+def _txt_record_set(records, zone_url="example.com"):
+    zone_name = zone_url_to_name(zone_url)
+    return terraform_TXT_record_set(records, zone_url, zone_name, terraform_zone_suffix(zone_name))
+
+
+def test_at_data_is_inlined_zone_url():
+    block = _txt_record_set([{"data": "@", "name": "@", "ttl": 3600, "type": "TXT"}])
+    assert 'rrdatas = ["\\"example.com\\""]' in block
+    assert 'name = "${google_dns_managed_zone.example-com.dns_name}"' in block
+
+
+def test_name_uses_terraform_variable():
+    block = _txt_record_set([{"data": "v=spf1 ~all", "name": "sub", "ttl": 3600, "type": "TXT"}])
+    assert 'resource "google_dns_record_set" "sub-example-com-txt"' in block
+    assert 'name = "sub.${google_dns_managed_zone.example-com.dns_name}"' in block
+    assert 'rrdatas = ["\\"v=spf1 ~all\\""]' in block
@@ -0,0 +1,87 @@
+"""TokenBucket rate limiter, driven by a fake clock so no test actually sleeps."""
+import types
+
+import pytest
+
+import godaddy_dns
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.waits = []
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeCondition:
+    """Stands in for threading.Condition: waiting advances the fake clock instead of blocking."""
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def wait(self, timeout):
+        self.clock.waits.append(timeout)
+        self.clock.advance(timeout)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(godaddy_dns, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _bucket(clock, rate, burst):
+    bucket = godaddy_dns.TokenBucket(rate, burst=burst)
+    bucket._cond = FakeCondition(clock)
+    return bucket
+
+
+def test_burst_then_waits_for_refill(clock):
+    bucket = _bucket(clock, rate=2.0, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.waits == []
+
+    bucket.acquire()
+    assert clock.waits == [pytest.approx(0.5)]
+
+
+def test_refill_is_capped_at_burst(clock):
+    bucket = _bucket(clock, rate=1.0, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.advance(100)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.waits == []
+
+    bucket.acquire()
+    assert clock.waits == [pytest.approx(1.0)]
+
+
+def test_partial_refill(clock):
+    bucket = _bucket(clock, rate=1.0, burst=1)
+    bucket.acquire()
+
+    clock.advance(0.25)
+    bucket.acquire()
+    assert clock.waits == [pytest.approx(0.75)]
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 1), (-1.0, 1), (1.0, 0), (1.0, -2)])
+def test_rejects_invalid_settings(rate, burst):
+    with pytest.raises(ValueError):
+        godaddy_dns.TokenBucket(rate, burst=burst)